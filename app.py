@@ -1,82 +1,21 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import requests
-import yaml
 import time
 
-# --- CONFIGURATION ---
-st.set_page_config(page_title="Physics-based Verification Demo // dexdogs", layout="wide")
-
-# !!! CRITICAL: UPDATE THESE TO MATCH YOUR GITHUB REPO !!!
-GITHUB_USER = "dexdogs" 
-REPO_NAME = "global-physics-standard"
-BRANCH = "main"
-
-# 17 SECTOR DEFINITIONS (VCM Standard)
-SECTORS = {
-    "13": "Waste handling and disposal",
-    "01": "Energy industries",
-    "03": "Energy demand",
-    "14": "Afforestation/Reforestation",
-    "15": "Agriculture",
-    "07": "Transport"
-}
-
-# --- BACKEND FUNCTIONS ---
-
-def get_github_physics(sector_id):
-    """Fetches the live 'Golden Physics' YAML from GitHub with Debug Info."""
-    filename = f"sector_{sector_id}_waste.yaml"
-    url = f"https://raw.githubusercontent.com/{GITHUB_USER}/{REPO_NAME}/{BRANCH}/{filename}"
-    
-    # DEBUG DRAWER IN SIDEBAR
-    st.sidebar.markdown("---")
-    st.sidebar.subheader("Debug Terminal")
-    st.sidebar.caption(f"Target URL: {url}")
-    
-    try:
-        # Use a timestamp to prevent GitHub caching during live edits
-        response = requests.get(f"{url}?t={int(time.time())}")
-        
-        if response.status_code == 200:
-            st.sidebar.success("URL Status: 200 (Found)")
-            return yaml.safe_load(response.text)
-        elif response.status_code == 404:
-            st.sidebar.error("URL Status: 404 (File Not Found)")
-            st.sidebar.info("Check: 1. Username 2. Repo Name 3. Branch 4. Filename case sensitivity")
-            return None
-        else:
-            st.sidebar.error(f"URL Status: {response.status_code}")
-            return None
-    except Exception as e:
-        st.sidebar.error(f"Connection Error: {e}")
-        return None
+import streamlit as st
 
-def simulate_pdd_extraction(uploaded_file, sector_id):
-    """Simulates Snowflake Cortex extracting physics from a PDD PDF."""
-    time.sleep(1.5)
-    # The PDD value we want to compare (Lumbini/Vinca often around 0.05)
-    return {
-        "project_id": "VCS-2491",
-        "extracted_k_value": 0.05, 
-        "methodology": "ACM0001",
-        "gas_density": 0.717
-    }
+from physics_core import (
+    SECTOR_IDS,
+    SECTORS,
+    audit_kernel,
+    downsample_for_chart,
+    generate_site_data,
+    get_github_physics,
+    get_github_physics_bulk,
+    simulate_pdd_extraction,
+    to_json,
+)
 
-def generate_site_data(sector_id):
-    """Generates synthetic IoT data for the PINN graph."""
-    dates = pd.date_range(start="2026-02-01", periods=24, freq="H")
-    if sector_id == "13":
-        df = pd.DataFrame({
-            "Timestamp": dates,
-            "Well_Pressure_kPa": np.random.normal(90, 2, 24),
-            "Flow_Rate_SCFM": np.random.normal(800, 50, 24)
-        })
-        # Inject an anomaly at the end to show 'Forensic Alert'
-        df.loc[20:23, "Well_Pressure_kPa"] = 35 
-        return df
-    return pd.DataFrame({"Timestamp": dates, "Sensor": np.random.normal(100, 5, 24)})
+# --- CONFIGURATION ---
+st.set_page_config(page_title="Physics-based Verification Demo // dexdogs", layout="wide")
 
 # --- UI LAYOUT ---
 
@@ -87,7 +26,7 @@ st.markdown("### Physics-nerd AI assistant for the VVBs/auditors of the world")
 st.sidebar.header("1. Audit Scope")
 selected_sector_id = st.sidebar.selectbox(
     "Select Sectoral Scope",
-    options=list(SECTORS.keys()),
+    options=SECTOR_IDS,
     format_func=lambda x: f"{x} - {SECTORS[x]}"
 )
 st.sidebar.markdown(f"[View VCM Sector Definitions](https://cdm.unfccc.int/DOE/scopes.html)")
@@ -102,19 +41,23 @@ with col_left:
     st.subheader("3. Project Design Document (PDD) Science Extraction")
     if pdd_file:
         with st.spinner("Snowflake Cortex analyzing PDF..."):
+            extraction_start = time.perf_counter()
             pdd_data = simulate_pdd_extraction(pdd_file, selected_sector_id)
+            extraction_s = time.perf_counter() - extraction_start
         st.info(f"📄 **PDD Scanned:** '{pdd_file.name}'")
-        st.markdown(f"**Extracted k-value:** `{pdd_data['extracted_k_value']}`")
+        st.markdown(f"**Extracted k-value:** `{pdd_data.extracted_k_value}`")
         with st.expander("View Full Extraction JSON"):
-            st.json(pdd_data)
+            st.code(to_json(pdd_data), language="json")
     else:
         st.warning("Please upload a PDD to begin.")
 
     st.divider()
     
     st.subheader("4. Scientific Oracle (GitHub)")
+    # Syncs are cached for 60s; force a refetch during live edits to the YAML
+    force_refresh = st.checkbox("Force refresh", help="Bypass the app's caches and GitHub's CDN cache and refetch from GitHub")
     if st.button("🔄 Sync with GitHub Live", type="secondary"):
-        github_physics = get_github_physics(selected_sector_id)
+        github_physics = get_github_physics(selected_sector_id, force=force_refresh)
         if github_physics:
             st.session_state['physics'] = github_physics
             st.success("✅ Science Standard Synced")
@@ -122,27 +65,50 @@ with col_left:
         else:
             st.error("Check Debug Terminal in Sidebar for details.")
 
+    with st.expander("All Sector Standards"):
+        if st.button("Sync all sectors"):
+            all_physics = get_github_physics_bulk(SECTOR_IDS)
+            rows = []
+            for sid, (physics, status) in all_physics.items():
+                if physics:
+                    state = "Synced"
+                elif status == 404:
+                    state = "Not published"
+                elif isinstance(status, Exception):
+                    state = f"Fetch error: {type(status).__name__}"
+                else:
+                    state = f"URL Status: {status}"
+                rows.append({
+                    "Sector": f"{sid} - {SECTORS[sid]}",
+                    "Required k-value": physics['physics_standards'].get('methane_decay_k') if physics else None,
+                    "Status": state,
+                })
+            st.table(rows)
+
 with col_right:
     st.subheader("5. Field Data & Physics Audit")
     
     # Site Data Chart
-    site_data = generate_site_data(selected_sector_id)
-    st.line_chart(site_data.set_index("Timestamp"))
+    if st.button("🎲 Regenerate Site Data"):
+        st.session_state['site_nonce'] = st.session_state.get('site_nonce', 0) + 1
+    site_data = generate_site_data(selected_sector_id, st.session_state.get('site_nonce', 0))
+    st.line_chart(downsample_for_chart(site_data))
     st.caption("Live IoT Stream: Well Pressure vs Time")
     
     # THE PINN EXECUTION
     st.divider()
     if st.button("Check with your Physics nerd Assistant AI", type="primary"):
         if 'physics' in st.session_state and pdd_file:
+            audit_start = time.perf_counter()
             
-            pdd_k = pdd_data['extracted_k_value']
+            pdd_k = pdd_data.extracted_k_value
             std_k = st.session_state['physics']['physics_standards']['methane_decay_k']
             
             st.markdown("### 🔍 Verification Results")
             
             # THE DASHBOARD
             res1, res2, res3 = st.columns(3)
-            res1.metric("Methodology", pdd_data['methodology'])
+            res1.metric("Methodology", pdd_data.methodology)
             
             # COMPARISON LOGIC
             if abs(pdd_k - std_k) < 0.001:
@@ -153,7 +119,26 @@ with col_right:
                 st.error(f"❌ **FAIL:** Project uses k={pdd_k}. Scientific Oracle requires k={std_k}.")
                 st.warning("⚠️ **VVB ALERT:** Liability detected. Do not issue credits.")
             
-            res3.metric("Audit Latency", "1.5s", delta="Manual: 45 Days", delta_color="inverse")
+            # FORENSIC PINN CHECK OVER THE IOT STREAM
+            if "Well_Pressure_kPa" in site_data:
+                tol = st.session_state['physics']['physics_standards'].get('ideal_gas_law_tolerance', 0.10)
+                n_violations, first_idx, residual_max = audit_kernel(
+                    site_data["Well_Pressure_kPa"].to_numpy(),
+                    site_data["Flow_Rate_SCFM"].to_numpy(),
+                    float(tol)
+                )
+                if n_violations:
+                    st.warning(
+                        f"⚠️ **Forensic Alert:** {n_violations} of {len(site_data)} readings violate the pressure/flow physics, "
+                        f"first at {site_data.index[first_idx]:%Y-%m-%d %H:%M} (max residual {residual_max:.0%})."
+                    )
+                else:
+                    st.success("✅ IoT stream is consistent with the physics standard.")
+            
+            # Measured PDD extraction + audit time (no 1.5s demo delay when DEXDOGS_DEMO_DELAYS=0)
+            latency_s = extraction_s + time.perf_counter() - audit_start
+            latency = f"{latency_s:.1f}s" if latency_s >= 1 else f"{latency_s * 1000:.0f}ms"
+            res3.metric("Audit Latency", latency, delta="Manual: 45 Days", delta_color="inverse")
                 
         else:
             st.error("Missing Data: Please ensure PDD is uploaded and GitHub is Synced.")